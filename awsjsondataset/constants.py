@@ -2,17 +2,20 @@ service_size_limits_bytes = {
     "sqs": {
         "max_batch_size": 10,
         "max_batch_size_bytes": 262144,
-        "max_record_size_bytes": 262144
+        "max_record_size_bytes": 262144,
+        "record_delimiter_bytes": 0
     },
     "sns": {
         "max_batch_size": 10,
         "max_batch_size_bytes": 262144,
-        "max_record_size_bytes": 262144
+        "max_record_size_bytes": 262144,
+        "record_delimiter_bytes": 0
     },
     "firehose": {
         "max_batch_size": 500,
-        "max_batch_size_bytes": 5242880,
-        "max_record_size_bytes": 1048576
+        "max_batch_size_bytes": 4194304,
+        "max_record_size_bytes": 1024000,
+        "record_delimiter_bytes": 1
     },
 }
 
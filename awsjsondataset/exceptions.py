@@ -8,7 +8,13 @@ logger.setLevel(logging.INFO)
 
 class InvalidJsonDataset(ValueError):
     """Raised when an invalid dataset type is passed"""
+
+    def __init__(self, index: int = None) -> None:
+        self.index: int = index
+
     def __str__(self):
+        if self.index is not None:
+            return f'JSON array must contain only objects; record {self.index} is not an object'
         return 'JSON must contain array as top-level element'
 
 class MissingRecords(Exception):
@@ -20,3 +26,25 @@ class MissingRecords(Exception):
 
     def __str__(self):
         return f'Expected {self.expected} records to be processed but got {self.actual}'
+
+
+class RecordSizeLimitExceeded(ValueError):
+    """Raised when a record is larger than a size limit"""
+
+    def __init__(self, size: int, limit: int) -> None:
+        self.size: int = size
+        self.limit: int = limit
+
+    def __str__(self):
+        return f'Record size of {self.size} bytes exceeds the limit of {self.limit} bytes'
+
+
+class ServiceRecordSizeLimitExceeded(RecordSizeLimitExceeded):
+    """Raised when a record is larger than an AWS service accepts"""
+
+    def __init__(self, service: str, size: int, limit: int) -> None:
+        super().__init__(size, limit)
+        self.service: str = service
+
+    def __str__(self):
+        return f'Record size of {self.size} bytes exceeds the {self.service} limit of {self.limit} bytes'
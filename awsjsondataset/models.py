@@ -1,14 +1,16 @@
 import logging
-from typing import Optional
+from typing import Optional, Iterator, List
 from pathlib import Path
-from functools import cached_property
-import json
+from functools import cached_property, partial
+from operator import itemgetter
+import orjson
 from awsjsondataset.types import JSONDataset, JSONLocalPath
+from awsjsondataset.exceptions import RecordSizeLimitExceeded
 from awsjsondataset.utils import (
-    sort_records_by_size_bytes, 
-    max_record_size_bytes,
+    serialize_record,
     validate_data,
-    get_available_services_by_limit
+    get_available_services_by_limit,
+    iter_json_records
 )
 from awsjsondataset.services.models import aws_service_class_map
 
@@ -16,25 +18,17 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
-class DatetimeEncoder(json.JSONEncoder):
-    """Extension of ``json.JSONEncoder`` to convert Python datetime objects to pure strings.
-
-    Useful for responses from AWS service APIs. Does not convert timezone information.
-    """
-
-    def default(self, obj):
-        try:
-            return super().default(obj)
-        except TypeError:
-            return str(obj)
-
-
 class JsonDataset:
     """A class to read and write JSON-formatted datasets.
 
+    A streamed dataset holds no records, so ``num_records``, ``len`` and
+    ``save`` raise ``TypeError`` until ``load`` is called.
+
     Args:
         data (JSONDataset): A list of dictionaries representing the dataset.
         path (JSONLocalPath): A path to a local JSON file.
+        stream (bool): If True, records are streamed from ``path`` by
+            ``iter_records`` instead of being loaded on init.
 
     Attributes:
         data (JSONDataset): A list of dictionaries representing the dataset.
@@ -45,10 +39,7 @@ class JsonDataset:
         TypeError: If both ``data`` and ``path`` are passed.
     """
 
-    # trying slots for more speed
-    __slots__ = '__dict__'
-
-    def __init__(self, data: JSONDataset = None, path: Path = None) -> None:
+    def __init__(self, data: JSONDataset = None, path: Path = None, stream: bool = False) -> None:
 
         # if both data and path are passed, raise TypeError
         if data is not None and path is not None:
@@ -58,39 +49,68 @@ class JsonDataset:
         self.data: Optional[JSONDataset] = validate_data(data) if data is not None else None
         self.path: Optional[JSONLocalPath] = path if path is not None else None
 
-        if self.path is not None:
+        if self.path is not None and not stream:
             self.load(self.path)
 
+    # cached properties derived from data
+    _cached_attrs = ('_encoded', '_sort_records_by_size_bytes', '_max_record_size_bytes')
+
+    @property
+    def data(self) -> Optional[JSONDataset]:
+        return self._data
+
+    @data.setter
+    def data(self, data: Optional[JSONDataset]) -> None:
+        self._data = data
+
+        # invalidate anything computed from the previous records
+        for attr in self._cached_attrs:
+            self.__dict__.pop(attr, None)
+
     @property
     def num_records(self) -> int:
-        return len(self.data)
+        return len(self._loaded_data())
+
+    def _loaded_data(self) -> JSONDataset:
+        if self.data is None:
+            raise TypeError(f"{type(self).__name__} has no records loaded; call load() or use iter_records()")
+        return self.data
+
+    # each record is serialized once and reused for sizing
+    @cached_property
+    def _encoded(self) -> List[bytes]:
+        return [ serialize_record(record) for record in self.data ]
     
     @cached_property
     def _sort_records_by_size_bytes(self):
-        return sort_records_by_size_bytes(self.data)
+        records_by_size_bytes = list(zip(self.data, map(len, self._encoded)))
+        records_by_size_bytes.sort(key=itemgetter(1))
+        return records_by_size_bytes
     
     @cached_property
     def _max_record_size_bytes(self):
-        return max_record_size_bytes(self.data)
+        return max(map(len, self._encoded), default=0)
 
     def _read_local(self, path: JSONLocalPath) -> JSONDataset:
         # TODO support for JSON lines format
         # TODO support for multiple files
-        with open(path, 'r') as f:
-            data = json.load(f)
-            if not isinstance(data, list):
-                data = [data]
+        data = orjson.loads(Path(path).read_bytes())
+        if not isinstance(data, list):
+            data = [data]
 
         return data
 
     def _write_local(self, path: JSONLocalPath):
-        with open(path, 'w', encoding='utf-8') as file:
-            json.dump(
-                self.data,
-                file,
-                ensure_ascii=False,
-                indent=4,
-                cls=DatetimeEncoder)
+        with open(path, 'wb') as file:
+            file.write(
+                orjson.dumps(
+                    self.data,
+                    default=str,
+                    option=(
+                        orjson.OPT_INDENT_2
+                        | orjson.OPT_NON_STR_KEYS
+                        | orjson.OPT_NAIVE_UTC
+                        | orjson.OPT_SERIALIZE_NUMPY)))
 
     def load(self, path: Path) -> JSONDataset:
         """Handles loading a dataset from a local or remote file.
@@ -104,20 +124,53 @@ class JsonDataset:
         # TODO: support S3 download
         self.data = self._read_local(path)
 
+    def iter_records(self, buffer_size: int = 65536, max_record_size_bytes: int = None) -> Iterator[dict]:
+        """Iterates over the records in the dataset.
+
+        Records are streamed from ``path`` when the dataset has not been loaded.
+
+        Args:
+            buffer_size (int): Number of bytes read from the file at a time.
+            max_record_size_bytes (int): Reject records larger than this.
+
+        Yields:
+            dict: Each record in the dataset.
+
+        Raises:
+            RecordSizeLimitExceeded: If a record is larger than ``max_record_size_bytes``.
+        """
+        if self.data is not None:
+            # loaded records are checked up front from their cached sizes
+            if max_record_size_bytes is not None and self._max_record_size_bytes > max_record_size_bytes:
+                raise RecordSizeLimitExceeded(size=self._max_record_size_bytes, limit=max_record_size_bytes)
+            yield from self.data
+        else:
+            yield from iter_json_records(
+                self.path,
+                buffer_size=buffer_size,
+                max_record_size_bytes=max_record_size_bytes)
+
     def save(self, path: Path):
         # support writing to JSON lines
         # TODO: support S3 upload
+        self._loaded_data()
         return self._write_local(path)
 
     def __len__(self) -> int:
         return self.num_records
 
     def __repr__(self) -> str:
-        return f"JsonDataset()"
+        # only the first record is serialized so the preview stays cheap for large datasets
+        if self.data:
+            preview = serialize_record(self.data[0])[:30].decode("utf-8", "ignore")
+            return f"{type(self).__name__}(data='{preview}...', num_records={self.num_records})"
+        return f"{type(self).__name__}(path={self.path!r})"
 
 
 class BaseAwsJsonDataset(JsonDataset):
 
+    _cached_attrs = JsonDataset._cached_attrs + ('available_services',)
+
     def __init__(self,
             data: JSONDataset = None,
             path: JSONLocalPath = None,
@@ -129,19 +182,20 @@ class BaseAwsJsonDataset(JsonDataset):
     def available_services(self):
         return get_available_services_by_limit(self._max_record_size_bytes)
 
-    def __repr__(self) -> str:
-        return f"BaseAwsJsonDataset()"
-
 
 class AwsJsonDataset(BaseAwsJsonDataset):
 
-    def __init__(self, **kwargs) -> None:
-        super().__init__(**kwargs)
+    def __getattr__(self, name: str):
+        # services are resolved on access so they follow reassigned data
+        if name in aws_service_class_map and name in self.available_services:
+            return partial(self._bind_service, aws_service_class_map[name])
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
 
-        for item in self.available_services:
-            setattr(self, item, aws_service_class_map[item])
-            setattr(self.__getattribute__(item), 'data', self.data)
+    def _bind_service(self, service_class, *args, **kwargs):
+        service = service_class(*args, **kwargs)
+        service.data = self.data
 
-    def __repr__(self) -> str:
-        return f"AwsJsonDataset()"
+        # reuse the records already encoded for sizing instead of serializing them again
+        service.payloads = self._encoded
+        return service
     
\ No newline at end of file
@@ -1,19 +1,39 @@
 # Python models to wrap AWS services including S3, SNS, SQS, and Firehose
 # Methods are available in awsjsondataset.services.utils
 import os
+import asyncio
 import logging
-from functools import cached_property
+from functools import cached_property, lru_cache
 import boto3
+from botocore.config import Config
 from awsjsondataset.services.utils import (
+    _client_config_options,
+    get_aio_session,
     send_messages,
+    send_messages_async,
     publish_messages_batch,
-    put_records_batch
+    put_records_batch,
+    put_records_async
 )
 
 # set up logger
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# shared client config with room for concurrent batch requests
+_boto_config = Config(max_pool_connections=64, **_client_config_options)
+
+
+# sessions and clients are expensive to create, so they are reused across instances
+@lru_cache(maxsize=None)
+def _get_session(region_name: str = None) -> boto3.Session:
+    return boto3.Session(region_name=region_name)
+
+
+@lru_cache(maxsize=None)
+def _get_client(service_name: str, region_name: str = None):
+    return _get_session(region_name).client(service_name, config=_boto_config)
+
 
 class AwsServiceBase:
     """A base class for AWS services.
@@ -23,17 +43,50 @@ class AwsServiceBase:
 
     Attributes:
         boto3_session (boto3.session.Session): The boto3 session.
+        data (JSONDataset): The records to send.
+        payloads (List[bytes]): The records already encoded, reused when sending.
     """
+
+    _data = None
+    payloads = None
+
     def __init__(self) -> None:
-        self.boto3_session = boto3.Session()
+        self.boto3_session = _get_session()
         self.region_name = self.boto3_session.region_name
 
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data) -> None:
+        self._data = data
+
+        # encoded payloads only apply to the records they were built from
+        self.payloads = None
+
     # get the account ID
     @cached_property
     def account_id(self):
-        account_id = self.boto3_session.client('sts').get_caller_identity().get('Account')
+        account_id = _get_client('sts', self.region_name).get_caller_identity().get('Account')
         logger.info(f"Account ID: {account_id}")
         return account_id
+
+    def close(self) -> None:
+        """Closes the pooled connections of the client.
+
+        Clients are shared between wrappers, so the client stays usable and
+        reconnects on the next request.
+        """
+        client = self.__dict__.get('client')
+        if client is not None:
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
     
 
 class SqsQueue(AwsServiceBase):
@@ -41,16 +94,19 @@ class SqsQueue(AwsServiceBase):
 
     Args:
         queue_url (str): The URL of the SQS queue.
+        max_workers (int): The number of batches sent concurrently.
 
     Attributes:
         queue_url (str): The URL of the SQS queue.
+        max_workers (int): The number of batches sent concurrently.
         client (boto3.client): The boto3 client for the SQS queue.
     """
 
-    def __init__(self, queue_url: str, **kwargs) -> None:
+    def __init__(self, queue_url: str, max_workers: int = 32, **kwargs) -> None:
         super().__init__(**kwargs)
         self.queue_url = queue_url if queue_url.startswith("http") else f"https://sqs.{self.region_name}.amazonaws.com/{self.account_id}/{queue_url}"
-        self.client = self.boto3_session.client('sqs')
+        self.max_workers = max_workers
+        self.client = _get_client('sqs', self.region_name)
 
     def send_messages(self) -> dict:
         """Queues records to the SQS queue.
@@ -61,7 +117,20 @@ class SqsQueue(AwsServiceBase):
         Returns:
             dict: The response from the SQS queue.
         """           
-        return send_messages(client=self.client, messages=self.data, queue_url=self.queue_url)
+        return send_messages(client=self.client, messages=self.data, queue_url=self.queue_url, max_workers=self.max_workers, payloads=self.payloads)
+
+    async def send_messages_async(self, concurrency: int = 64) -> None:
+        """Queues records to the SQS queue using ``aiobotocore``.
+
+        Falls back to ``send_messages`` in a worker thread when ``aiobotocore``
+        is not installed.
+
+        Args:
+            concurrency (int): Max number of requests in flight.
+        """
+        if get_aio_session is None:
+            return await asyncio.to_thread(self.send_messages)
+        return await send_messages_async(messages=self.data, queue_url=self.queue_url, region_name=self.region_name, concurrency=concurrency, payloads=self.payloads)
 
 
 class SnsTopic(AwsServiceBase):
@@ -69,17 +138,19 @@ class SnsTopic(AwsServiceBase):
 
     Args:
         topic_arn (str): The ARN of the SNS topic.
-        region_name (str): The AWS region name.
+        max_workers (int): The number of batches published concurrently.
 
     Attributes:
         topic_arn (str): The ARN of the SNS topic.
         region_name (str): The AWS region name.
+        max_workers (int): The number of batches published concurrently.
         client (boto3.client): The boto3 client for the SNS topic.
     """
-    def __init__(self, topic_arn: str, **kwargs) -> None:
+    def __init__(self, topic_arn: str, max_workers: int = 32, **kwargs) -> None:
         super().__init__(**kwargs)
         self.topic_arn = topic_arn
-        self.client = self.boto3_session.client('sns')
+        self.max_workers = max_workers
+        self.client = _get_client('sns', self.region_name)
 
     def publish_messages(self) -> dict:
         """Publishes a batch of messages to the SNS topic.
@@ -90,7 +161,7 @@ class SnsTopic(AwsServiceBase):
         Returns:
             dict: The response from the SNS topic.
         """
-        return publish_messages_batch(client=self.client, messages=self.data, topic_arn=self.topic_arn)
+        return publish_messages_batch(client=self.client, messages=self.data, topic_arn=self.topic_arn, max_workers=self.max_workers, payloads=self.payloads)
 
 
 class KinesisFirehoseDeliveryStream(AwsServiceBase):
@@ -98,17 +169,19 @@ class KinesisFirehoseDeliveryStream(AwsServiceBase):
 
     Args:
         stream_name (str): The name of the Kinesis Firehose delivery stream.
-        region_name (str): The AWS region name.
+        max_workers (int): The number of batches put concurrently.
 
     Attributes:
         stream_name (str): The name of the Kinesis Firehose delivery stream.
         region_name (str): The AWS region name.
+        max_workers (int): The number of batches put concurrently.
         client (boto3.client): The boto3 client for the Kinesis Firehose delivery stream.
     """
-    def __init__(self, stream_name: str, **kwargs) -> None:
+    def __init__(self, stream_name: str, max_workers: int = 32, **kwargs) -> None:
         super().__init__(**kwargs)
         self.stream_name = stream_name
-        self.client = self.boto3_session.client('firehose')
+        self.max_workers = max_workers
+        self.client = _get_client('firehose', self.region_name)
 
     def put_records(self) -> dict:
         """Puts a batch of records to the Kinesis Firehose delivery stream.
@@ -119,7 +192,20 @@ class KinesisFirehoseDeliveryStream(AwsServiceBase):
         Returns:
             dict: The response from the Kinesis Firehose delivery stream.
         """
-        return put_records_batch(client=self.client, records=self.data, stream_name=self.stream_name)
+        return put_records_batch(client=self.client, records=self.data, stream_name=self.stream_name, max_workers=self.max_workers, payloads=self.payloads)
+
+    async def put_records_async(self, concurrency: int = 64) -> None:
+        """Puts records to the Kinesis Firehose delivery stream using ``aiobotocore``.
+
+        Falls back to ``put_records`` in a worker thread when ``aiobotocore``
+        is not installed.
+
+        Args:
+            concurrency (int): Max number of requests in flight.
+        """
+        if get_aio_session is None:
+            return await asyncio.to_thread(self.put_records)
+        return await put_records_async(records=self.data, stream_name=self.stream_name, region_name=self.region_name, concurrency=concurrency, payloads=self.payloads)
     
 # create service lookup map
 aws_service_class_map = {
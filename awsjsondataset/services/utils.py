@@ -1,95 +1,279 @@
 import sys
 import logging
-from typing import List, Union, Dict
+from typing import List, Union, Dict, Tuple, Iterator, Iterable, Sequence
 import json
+import asyncio
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import boto3
 from botocore.exceptions import ClientError
-from awsjsondataset.exceptions import MissingRecords
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import get_session as get_aio_session
+except ImportError:
+    AioConfig = None
+    get_aio_session = None
+from awsjsondataset.exceptions import MissingRecords, ServiceRecordSizeLimitExceeded
 from awsjsondataset.types import JSONDataset
 from awsjsondataset.constants import service_size_limits_bytes
-from awsjsondataset.utils import (
-    get_record_size_bytes
-)
+from awsjsondataset.utils import serialize_record
 
 # initialize logger using basicConfig
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-### SQS ###
-def send_messages(client, messages: JSONDataset, queue_url: str):
+# Entry Ids only need to be unique within a batch request, so they are
+# taken from a fixed set of strings instead of formatting one per record.
+# They are paired strictly so a batch with more records than Ids raises
+# instead of silently dropping the extra records
+_ENTRY_IDS = tuple(str(i) for i in range(max(
+    service_size_limits_bytes[service]["max_batch_size"] for service in ("sqs", "sns"))))
 
-    if len(messages) > 10:
-        return send_message_batch(client, messages, queue_url)
-    else:
-        counter = 0
-        errors = 0
+# client options shared by the sync and async clients, which only differ
+# in the size of their connection pools
+# keepalive and adaptive retries avoid reconnecting and thrashing under throttling
+_client_config_options = {
+    "tcp_keepalive": True,
+    "retries": {'max_attempts': 10, 'mode': 'adaptive'}
+}
 
-        for message in messages:
-            counter += 1
-            response = client.send_message(
-                QueueUrl=queue_url,
-                MessageBody=json.dumps(message)
-            )
+def _aio_config(concurrency: int):
+    # a connection per request in flight
+    return AioConfig(max_pool_connections=concurrency, **_client_config_options)
 
-            if response["ResponseMetadata"]["HTTPStatusCode"] != 200:
-                logger.error("Failed to send message")
-                counter -= 1
-                errors += 1
+def _iter_batches(payloads: Iterable[bytes], service: str, delimiter_bytes: int = 0) -> Iterator[List[Tuple[int, bytes]]]:
+    """Group encoded records into batches within the limits of an AWS service.
 
-        logger.info(f'{counter} messages queued to {queue_url}')
+    A batch is yielded when it reaches the max batch size or when the next
+    record would push it over the max payload size.
 
+    Args:
+        payloads (Iterable[bytes]): The encoded records to batch.
+        service (str): The service key in ``service_size_limits_bytes``.
+        delimiter_bytes (int, optional): Bytes appended to each record when sent. Defaults to 0.
 
-def send_message_batch(client, messages: JSONDataset, queue_url: str):
+    Raises:
+        ServiceRecordSizeLimitExceeded: If a record is larger than the service accepts.
 
-    if len(messages) < 10:
-        raise Exception("Batch size must be greater than 10")
+    Yields:
+        List[Tuple[int, bytes]]: The index and encoded body of each record in the batch.
+    """
+    max_batch_size = service_size_limits_bytes[service]["max_batch_size"]
+    max_batch_size_bytes = service_size_limits_bytes[service]["max_batch_size_bytes"]
+    max_record_size_bytes = service_size_limits_bytes[service]["max_record_size_bytes"]
 
+    # hot loop: the record size is computed once and the batch length is tracked
+    # as an integer so each iteration is a few comparisons
     batch = []
+    batch_count = 0
     batch_bytes = 0
-    counter = 0
-    max_bytes = service_size_limits_bytes["sqs"]["max_record_size_bytes"]
+    for idx, body in enumerate(payloads):
+        size = len(body) + delimiter_bytes
+        if size > max_record_size_bytes:
+            raise ServiceRecordSizeLimitExceeded(service=service, size=size, limit=max_record_size_bytes)
+
+        if batch_count and ((batch_count == max_batch_size) or (batch_bytes + size > max_batch_size_bytes)):
+            yield batch
+            batch = []
+            batch_count = 0
+            batch_bytes = 0
+
+        batch.append((idx, body))
+        batch_count += 1
+        batch_bytes += size
+
+    # Include remaining JSON objects
+    if batch:
+        yield batch
+
+
+def _check_record_sizes(payloads: Sequence[bytes], service: str) -> None:
+    """Check that no encoded record is larger than an AWS service accepts.
+
+    Raises:
+        ServiceRecordSizeLimitExceeded: If a record is larger than the service accepts.
+    """
+    limits = service_size_limits_bytes[service]
+    size = max(map(len, payloads), default=0) + limits["record_delimiter_bytes"]
+    if size > limits["max_record_size_bytes"]:
+        raise ServiceRecordSizeLimitExceeded(service=service, size=size, limit=limits["max_record_size_bytes"])
+
+
+def _encode_records(records: Iterable[dict], payloads: List[bytes] = None) -> Iterable[bytes]:
+    """Reuse already encoded records when available, otherwise encode them lazily."""
+    return payloads if payloads is not None else map(serialize_record, records)
+
+### SQS ###
+def send_messages(client, messages: JSONDataset, queue_url: str, max_workers: int = 32, payloads: List[bytes] = None):
+    """Send messages to an SQS queue in batches of up to 10 messages.
+
+    Args:
+        client (SQS.Client): Boto3 client for SQS.
+        messages (JSONDataset): List or iterator of messages.
+        queue_url (str): SQS queue URL.
+        max_workers (int, optional): Number of batches sent concurrently. Defaults to 32.
+        payloads (List[bytes], optional): Messages already encoded with ``serialize_record``. Defaults to None.
+
+    Lists and encoded payloads are size checked before anything is sent.
+    Iterators are batched as they are read, so an oversized message raises
+    after the batches before it have been sent.
+
+    Raises:
+        MissingRecords: If any message could not be sent.
+        ServiceRecordSizeLimitExceeded: If a message is larger than SQS accepts.
+    """
+    return _send_message_batches(client, messages, queue_url, max_workers, payloads)
+
+
+def send_message_batch(client, messages: JSONDataset, queue_url: str, max_workers: int = 32, payloads: List[bytes] = None):
+
+    if len(messages) < 10:
+        raise Exception("Batch size must be greater than 10")
+
+    return _send_message_batches(client, messages, queue_url, max_workers, payloads)
 
+
+def _send_entries(client, entries: list, queue_url: str) -> int:
+    """Send a batch of entries to an SQS queue.
+
+    A batch request can partially succeed, so entries listed as failed in
+    the response are retried individually.
+
+    Returns:
+        int: The number of messages sent.
+    """
+    response = client.send_message_batch(
+        QueueUrl=queue_url,
+        Entries=entries)
+
+    retries = _failed_message_bodies(entries, response)
+    counter = len(entries) - len(retries)
+    for body in retries:
+        try:
+            client.send_message(
+                QueueUrl=queue_url,
+                MessageBody=body)
+            counter += 1
+        except ClientError as e:
+            logger.error(e)
+
+    return counter
+
+
+def _failed_message_bodies(entries: list, response: dict) -> List[str]:
+    """Get the bodies of the entries an SQS batch response lists as failed.
+
+    Returns:
+        List[str]: The message bodies to retry individually.
+    """
+    failed = response.get("Failed", [])
+    if len(failed) == 0:
+        return []
+
+    bodies = { entry["Id"]: entry["MessageBody"] for entry in entries }
+    for item in failed:
+        logger.error(f'Failed to send message {item["Id"]}: {item.get("Message")}')
+
+    return [ bodies[item["Id"]] for item in failed ]
+
+
+def _iter_message_batches(messages: JSONDataset, payloads: List[bytes] = None) -> Iterator[list]:
+    """Group messages into SQS batch entries as they are read.
+
+    Yields:
+        list: ``SendMessageBatch`` entries.
+    """
     # SQS API accepts a max batch size of 10 max payload size of 256 kilobytes
-    for idx, record in enumerate(messages):
-        if get_record_size_bytes(record) > service_size_limits_bytes["sqs"]["max_record_size_bytes"]:
-            raise Exception(f'Record size must be less than {service_size_limits_bytes["sqs"]["max_record_size_bytes"]} bytes')
-
-        if (batch_bytes + get_record_size_bytes(record) < max_bytes) and (len(batch) < 10):
-            batch.append(record)
-        else:
-            entries = [
-                {
-                    'Id': str(batch_idx),
-                    'MessageBody': json.dumps(message)
-                } for batch_idx, message in enumerate(batch)
-            ]
-
-            response = client.send_message_batch(
-                QueueUrl=queue_url,                
-                Entries=entries)
-            if response["ResponseMetadata"]["HTTPStatusCode"] != 200:
-                logger.error("Failed to send message")
-                counter -= 1
-                errors += 1
-
-            counter += len(batch)
-            batch = [record]
-
-        batch_bytes = get_record_size_bytes(batch)
-
-    # Publish remaining JSON objects
-    if len(batch) > 0:
-        response = client.send_message_batch(
-            QueueUrl=queue_url,            
-            Entries=entries)
-        if response["ResponseMetadata"]["HTTPStatusCode"] != 200:
-            logger.error("Failed to send message")
-            counter -= len(batch)
-            errors += 1
-        counter += len(batch)
-
-        if counter != idx+1:
-            raise MissingRecords(expected=idx+1, actual=counter)
+    # The payload limit applies to the sum of the message bodies
+    for batch in _iter_batches(_encode_records(messages, payloads), "sqs"):
+        yield [
+            {
+                'Id': entry_id,
+                'MessageBody': body.decode("utf-8")
+            } for entry_id, (_, body) in zip(_ENTRY_IDS[:len(batch)], batch, strict=True)
+        ]
+
+
+def _send_message_batches(client, messages: JSONDataset, queue_url: str, max_workers: int = 32, payloads: List[bytes] = None):
+
+    # records already in memory are size checked before any batch is sent,
+    # only iterators are left to fail part way through
+    if payloads is None and isinstance(messages, Sequence):
+        payloads = [ serialize_record(message) for message in messages ]
+    if payloads is not None:
+        _check_record_sizes(payloads, "sqs")
+
+    # boto3 clients are thread safe, so batches are sent concurrently with a shared client
+    # batches are read lazily with a bounded number in flight, so records are
+    # parsed while earlier batches are sent and memory does not grow with the dataset
+    expected = 0
+    counter = 0
+    pending = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for entries in _iter_message_batches(messages, payloads):
+            if len(pending) >= 2 * max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                counter += sum(future.result() for future in done)
+            pending.add(executor.submit(_send_entries, client, entries, queue_url))
+            expected += len(entries)
+
+        counter += sum(future.result() for future in pending)
+
+    logger.info(f'{counter} messages queued to {queue_url}')
+
+    if counter != expected:
+        raise MissingRecords(expected=expected, actual=counter)
+
+
+async def send_messages_async(messages: JSONDataset, queue_url: str, region_name: str = None, concurrency: int = 64, payloads: List[bytes] = None):
+    """Send messages to an SQS queue with concurrent ``aiobotocore`` requests.
+
+    Requires the optional ``aiobotocore`` dependency.
+
+    Args:
+        messages (JSONDataset): List of messages.
+        queue_url (str): SQS queue URL.
+        region_name (str, optional): The AWS region name. Defaults to None.
+        concurrency (int, optional): Max number of requests in flight. Defaults to 64.
+        payloads (List[bytes], optional): Messages already encoded with ``serialize_record``. Defaults to None.
+
+    Raises:
+        MissingRecords: If any message could not be sent.
+    """
+    if get_aio_session is None:
+        raise ImportError("send_messages_async requires aiobotocore")
+
+    batches = list(_iter_message_batches(messages, payloads))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with get_aio_session().create_client('sqs', region_name=region_name, config=_aio_config(concurrency)) as client:
+
+        async def send_entries(entries: list) -> int:
+            async with semaphore:
+                response = await client.send_message_batch(
+                    QueueUrl=queue_url,
+                    Entries=entries)
+
+                retries = _failed_message_bodies(entries, response)
+                counter = len(entries) - len(retries)
+                for body in retries:
+                    try:
+                        await client.send_message(
+                            QueueUrl=queue_url,
+                            MessageBody=body)
+                        counter += 1
+                    except ClientError as e:
+                        logger.error(e)
+
+                return counter
+
+        counter = sum(await asyncio.gather(*[ send_entries(entries) for entries in batches ]))
+
+    logger.info(f'{counter} messages queued to {queue_url}')
+
+    expected = sum(len(entries) for entries in batches)
+    if counter != expected:
+        raise MissingRecords(expected=expected, actual=counter)
 
 ### SNS ###
 def publish_record(client, message: dict, topic_arn: str):
@@ -109,14 +293,14 @@ def publish_record(client, message: dict, topic_arn: str):
     try:
         response = client.publish(
             TopicArn=topic_arn,
-            Message=json.dumps(message)
+            Message=serialize_record(message).decode("utf-8")
         )
         return response
     except ClientError as e:
         logger.error(e)
         raise e
 
-def publish_messages_batch(client, messages: list, topic_arn: str, message_attributes: list = None) -> dict:
+def publish_messages_batch(client, messages: list, topic_arn: str, message_attributes: list = None, max_workers: int = 32, payloads: List[bytes] = None) -> dict:
     """Send a batch of messages in a single request to an SNS topic.
     This request may return overall success even when some messages were not published.
     The caller must inspect the Successful and Failed lists in the response and
@@ -127,6 +311,8 @@ def publish_messages_batch(client, messages: list, topic_arn: str, message_attri
         topic_arn (str): SNS Topic ARN.
         messages (list): List of messages.
         message_attributes (list, optional): List of attributes for each message, used for filtering. Defaults to None.
+        max_workers (int, optional): Number of batches published concurrently. Defaults to 32.
+        payloads (List[bytes], optional): Messages already encoded with ``serialize_record``. Defaults to None.
 
     Raises:
         error: ClientError
@@ -138,80 +324,43 @@ def publish_messages_batch(client, messages: list, topic_arn: str, message_attri
     if len(messages) < 10:
         raise Exception("Batch size must be greater than 10")
 
-    batch = []
-    batch_bytes = 0
-    counter = 0
-    max_bytes = service_size_limits_bytes["sns"]["max_record_size_bytes"]
-
     # SNS API accepts a max batch size of 10 max payload size of 256 kilobytes
-    for idx, record in enumerate(messages):
-        if get_record_size_bytes(record) > service_size_limits_bytes["sns"]["max_record_size_bytes"]:
-            raise Exception(f'Record size must be less than {service_size_limits_bytes["sns"]["max_record_size_bytes"]} bytes')
-
-        if (batch_bytes + get_record_size_bytes(record) < max_bytes) and (len(batch) < 10):
-            batch.append(record)
-        else:
-            entries = [
-                {
-                    'Id': str(idx),
-                    'Message': json.dumps(message)
-                } for idx, message in enumerate(batch)
-            ]
-
-            # TODO: Add message attributes
-            # if message_attributes is not None:
-            #     for item, attrs in zip(entries, message_attributes):
-            #         item["MessageAttributes"] = attrs
-
-            # logger.info(json.dumps(entries, indent=4))
-            logger.info(len(entries))
-            response = client.publish_batch(
-                TopicArn=topic_arn,
-                PublishBatchRequestEntries=entries)
-
-            if 'Successful' in response.keys():
-                # logger.info(f'Messages published: {json.dumps(response["Successful"])}')
-                logger.info(len(response["Successful"]))
-            if 'Failed' in response.keys():
-                if len(response['Failed']) > 0:
-                    logger.info(f'Messages failed: {json.dumps(response["Failed"])}')
-                    raise Exception("Failed to publish messages")
-                
-            counter += len(batch)
-            batch = [record]
-
-        batch_bytes = get_record_size_bytes(batch)
-
-    # Publish remaining JSON objects
-    if len(batch) > 0:
-        entries = [
+    # The payload limit applies to the sum of the message bodies
+    # TODO: Add message attributes
+    batches = [
+        [
             {
-                'Id': str(idx),
-                'Message': json.dumps(message)
-            } for idx, message in enumerate(batch)
-        ]
+                'Id': entry_id,
+                'Message': body.decode("utf-8")
+            } for entry_id, (_, body) in zip(_ENTRY_IDS[:len(batch)], batch, strict=True)
+        ] for batch in _iter_batches(_encode_records(messages, payloads), "sns")
+    ]
 
-        # TODO: Add message attributes
-        # if message_attributes is not None:
-        #     for item, attrs in zip(entries, message_attributes):
-        #         item["MessageAttributes"] = attrs
+    # boto3 clients are thread safe, so batches are published concurrently with a shared client
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        counter = sum(executor.map(partial(_publish_entries, client, topic_arn=topic_arn), batches))
 
-        response = client.publish_batch(
-            TopicArn=topic_arn,
-            PublishBatchRequestEntries=entries)
+    logger.info(f'{counter} messages published to {topic_arn}')
+
+    if counter != len(messages):
+        raise MissingRecords(expected=len(messages), actual=counter)
+
+
+def _publish_entries(client, entries: list, topic_arn: str) -> int:
+    """Publish a batch of entries to an SNS topic.
 
-        if 'Successful' in response.keys():
-            # logger.info(f'Messages published: {json.dumps(response["Successful"])}')
-            logger.info(len(response["Successful"]))
-        if 'Failed' in response.keys():
-            if len(response['Failed']) > 0:
-                logger.info(f'Messages failed: {json.dumps(response["Failed"])}')
-                raise Exception("Failed to publish messages")
-            
-        counter += len(batch)
+    Returns:
+        int: The number of messages published.
+    """
+    response = client.publish_batch(
+        TopicArn=topic_arn,
+        PublishBatchRequestEntries=entries)
 
-        if counter != idx+1:
-            raise MissingRecords(expected=idx+1, actual=counter)
+    if len(response.get('Failed', [])) > 0:
+        logger.info(f'Messages failed: {json.dumps(response["Failed"])}')
+        raise Exception("Failed to publish messages")
+
+    return len(entries)
 
 ### Kinesis Firehose ###
 def put_record(client, stream_name: str, data: str) -> Dict:
@@ -226,26 +375,30 @@ def put_record(client, stream_name: str, data: str) -> Dict:
         Dict: Response from Kinesis Firehose service.
     """
 
-    # validate record size
-    if get_record_size_bytes(data) > 1000000:
-        raise Exception("Record size must be less than 1 megabyte")
+    # validate record size using the newline delimited record that is sent
+    body = serialize_record(data, append_newline=True)
+    max_record_size_bytes = service_size_limits_bytes["firehose"]["max_record_size_bytes"]
+    if len(body) > max_record_size_bytes:
+        raise ServiceRecordSizeLimitExceeded(service="firehose", size=len(body), limit=max_record_size_bytes)
 
     response = client.put_record(
         DeliveryStreamName=stream_name,
         Record={
-            'Data': "".join([json.dumps(data, ensure_ascii=False), "\n"]).encode('utf8')
+            'Data': body
         })
     
     return response
 
 
-def put_records_batch(client, stream_name: str, records: list) -> Dict:
+def put_records_batch(client, stream_name: str, records: list, max_workers: int = 32, payloads: List[bytes] = None) -> Dict:
     """Streams a batch of records to AWS Kinesis Firehose.
 
     Args:
         client (boto3.client): Kinesis Firehose client.
         stream_name (str): Name of Firehose delivery stream.
         records (list): List of records.
+        max_workers (int, optional): Number of batches put concurrently. Defaults to 32.
+        payloads (List[bytes], optional): Records already encoded with ``serialize_record``. Defaults to None.
 
     Returns:
         Dict: Response from Kinesis Firehose service.
@@ -254,57 +407,99 @@ def put_records_batch(client, stream_name: str, records: list) -> Dict:
     if len(records) < 10:
         raise Exception("Total records must be greater than 10")
 
-    batch = []
-    batch_bytes = 0
-    counter = 0
-    max_bytes = service_size_limits_bytes["firehose"]["max_batch_size_bytes"]
-
-    # Kinesis API accepts a max batch size of 500 max payload size of 5 megabytes
-    for idx, record in enumerate(records):
-        if get_record_size_bytes(record) > service_size_limits_bytes["firehose"]["max_record_size_bytes"]:
-            raise Exception("Record size must be less than 1 megabyte")
-
-        if (batch_bytes + get_record_size_bytes(record) < max_bytes) and (len(batch) < 500):
-            batch.append(record)
-        else:
-            entries = [
-                {
-                    'Data': "".join([json.dumps(message, ensure_ascii=False), "\n"]).encode('utf8')
-                } for message in batch
-            ]
-
-            response = client.put_record_batch(
-                DeliveryStreamName=stream_name,
-                Records=entries)
-
-            if response["ResponseMetadata"]["HTTPStatusCode"] != 200:
-                logger.error("Failed to send message")
-                counter -= 1
-                errors += 1
-
-            counter += len(batch)
-            batch = [record]
-
-        batch_bytes = get_record_size_bytes(batch)
-
-    # Publish remaining JSON objects
-    if len(batch) > 0:
-        entries = [
+    batches = _build_record_batches(records, payloads)
+
+    # boto3 clients are thread safe, so batches are put concurrently with a shared client
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        counter = sum(executor.map(partial(_put_entries, client, stream_name=stream_name), batches))
+
+    logger.info(f'{counter} records put to {stream_name}')
+
+    if counter != len(records):
+        raise MissingRecords(expected=len(records), actual=counter)
+
+
+def _build_record_batches(records: JSONDataset, payloads: List[bytes] = None) -> List[list]:
+    """Group records into Kinesis Firehose batch entries.
+
+    Returns:
+        List[list]: Lists of ``PutRecordBatch`` entries.
+    """
+    # Kinesis API accepts a max batch size of 500 max payload size of 4 megabytes
+    # Records are encoded once and the encoded bytes are reused as the payload,
+    # with the newline delimiter counted against the limits
+    return [
+        [
             {
-                'Data': "".join([json.dumps(message, ensure_ascii=False), "\n"]).encode('utf8')
-            } for message in batch
-        ]
+                'Data': body + b"\n"
+            } for idx, body in batch
+        ] for batch in _iter_batches(_encode_records(records, payloads), "firehose", delimiter_bytes=service_size_limits_bytes["firehose"]["record_delimiter_bytes"])
+    ]
+
+
+async def put_records_async(stream_name: str, records: list, region_name: str = None, concurrency: int = 64, payloads: List[bytes] = None):
+    """Put records to a Kinesis Firehose delivery stream with concurrent ``aiobotocore`` requests.
+
+    Requires the optional ``aiobotocore`` dependency.
+
+    Args:
+        stream_name (str): Name of Firehose delivery stream.
+        records (list): List of records.
+        region_name (str, optional): The AWS region name. Defaults to None.
+        concurrency (int, optional): Max number of requests in flight. Defaults to 64.
+        payloads (List[bytes], optional): Records already encoded with ``serialize_record``. Defaults to None.
+
+    Raises:
+        MissingRecords: If any record could not be put.
+    """
+    if get_aio_session is None:
+        raise ImportError("put_records_async requires aiobotocore")
+
+    if len(records) < 10:
+        raise Exception("Total records must be greater than 10")
+
+    batches = _build_record_batches(records, payloads)
+    semaphore = asyncio.Semaphore(concurrency)
 
-        response = client.put_record_batch(
-            DeliveryStreamName=stream_name,
-            Records=entries)
+    async with get_aio_session().create_client('firehose', region_name=region_name, config=_aio_config(concurrency)) as client:
 
-        if response["ResponseMetadata"]["HTTPStatusCode"] != 200:
-            logger.error("Failed to send message")
-            counter -= len(batch)
-            errors += 1
-        counter += len(batch)
+        async def put_entries(entries: list) -> int:
+            async with semaphore:
+                response = await client.put_record_batch(
+                    DeliveryStreamName=stream_name,
+                    Records=entries)
+
+                return _count_put_records(entries, response, stream_name)
+
+        counter = sum(await asyncio.gather(*[ put_entries(entries) for entries in batches ]))
+
+    logger.info(f'{counter} records put to {stream_name}')
+
+    if counter != len(records):
+        raise MissingRecords(expected=len(records), actual=counter)
+
+
+def _put_entries(client, entries: list, stream_name: str) -> int:
+    """Put a batch of entries to a Kinesis Firehose delivery stream.
+
+    Returns:
+        int: The number of records put.
+    """
+    response = client.put_record_batch(
+        DeliveryStreamName=stream_name,
+        Records=entries)
+
+    return _count_put_records(entries, response, stream_name)
+
+
+def _count_put_records(entries: list, response: dict, stream_name: str) -> int:
+    """Count the records a ``PutRecordBatch`` response reports as put.
+
+    Returns:
+        int: The number of records put.
+    """
+    failed_put_count = response.get("FailedPutCount", 0)
+    if failed_put_count > 0:
+        logger.error(f'Failed to put {failed_put_count} records to {stream_name}')
 
-        if counter != idx+1:
-            raise MissingRecords(expected=idx+1, actual=counter)
-        
\ No newline at end of file
+    return len(entries) - failed_put_count
@@ -1,11 +1,19 @@
-import sys
 import logging
-from typing import List, Union, Dict
-import json
+from pathlib import Path
+from typing import List, Union, Dict, Iterator
+from itertools import chain
+from functools import lru_cache
+from bisect import bisect_left
+from operator import itemgetter
+import orjson
 import boto3
 from botocore.exceptions import ClientError
-from .types import JSONDataset
-from .exceptions import InvalidJsonDataset
+try:
+    import ijson
+except ImportError:
+    ijson = None
+from .types import JSONDataset, JSONLocalPath
+from .exceptions import InvalidJsonDataset, RecordSizeLimitExceeded
 from .constants import (
     service_size_limits_bytes,
     available_services
@@ -15,23 +23,39 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+def serialize_record(record: dict, append_newline: bool = False) -> bytes:
+    """Serialize a record to compact UTF-8 encoded JSON.
+
+    Args:
+        record (dict): The record to serialize.
+        append_newline (bool, optional): Append a newline delimiter. Defaults to False.
+
+    Returns:
+        bytes: JSON-encoded record
+    """
+    if append_newline:
+        return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS)
+
+
 def get_record_size_bytes(record: dict) -> int:
-    """Get the size of a record in bytes.
+    """Get the size of a record in bytes as sent to AWS services.
 
     Returns:
-        int: Size of record in bytes
+        int: Size of the UTF-8 encoded JSON record in bytes
     """
-    return sys.getsizeof(json.dumps(record))
+    return len(serialize_record(record))
 
 
 def sort_records_by_size_bytes(data: JSONDataset, ascending: bool = True):
-    records_by_size_bytes = [(record, get_record_size_bytes(record)) for record in data]
-    records_by_size_bytes.sort(key=lambda record: record[1], reverse=not ascending)
+    data = list(data)
+    records_by_size_bytes = list(zip(data, map(len, map(serialize_record, data))))
+    records_by_size_bytes.sort(key=itemgetter(1), reverse=not ascending)
     return records_by_size_bytes
 
 
 def max_record_size_bytes(data: JSONDataset):
-    return max([ item[1] for item in sort_records_by_size_bytes(data=data, ascending=False) ])
+    return max(map(len, map(serialize_record, data)), default=0)
 
 
 # TODO handle iterators
@@ -44,12 +68,98 @@ def validate_data(data: JSONDataset) -> List[Union[Dict, any]]:
     Returns:
         bool: True if all records are dictionaries, False otherwise.
     """
-    if not all([ isinstance(item, dict) for item in data ]):
-        raise InvalidJsonDataset()
+    # Decoded JSON objects are exactly dict, so the identity check settles
+    # the common case; subclasses fall through to isinstance.
+    if not all(type(item) is dict for item in data):
+        index = next((i for i, item in enumerate(data) if not isinstance(item, dict)), None)
+        if index is not None:
+            raise InvalidJsonDataset(index)
     return data
 
 
-def get_available_services_by_limit(max_record_size_bytes):
-    service_size_record_limits_bytes = { k: v["max_record_size_bytes"] for k, v in service_size_limits_bytes.items() }
-    service_status = [ (k, max_record_size_bytes < v)  for k, v in service_size_record_limits_bytes.items() ]
-    return [ x[0] for x in list(filter(lambda x: x[1] == True, service_status)) ]
+# (limit, service) pairs in ascending limit order; the sort is stable so
+# services sharing a limit keep their declaration order. Limits leave room
+# for the delimiter a service appends to each record when it is sent.
+_SORTED_SERVICE_LIMITS = sorted(
+    ((v["max_record_size_bytes"] - v["record_delimiter_bytes"], k) for k, v in service_size_limits_bytes.items()),
+    key=lambda item: item[0],
+)
+_SERVICE_LIMITS = [limit for limit, _ in _SORTED_SERVICE_LIMITS]
+_SERVICE_NAMES = tuple(name for _, name in _SORTED_SERVICE_LIMITS)
+
+
+@lru_cache(maxsize=256)
+def _services_by_limit(max_record_size_bytes: int) -> tuple:
+    # limits are inclusive: a record exactly at the limit is accepted
+    return _SERVICE_NAMES[bisect_left(_SERVICE_LIMITS, max_record_size_bytes):]
+
+
+def get_available_services_by_limit(max_record_size_bytes: int) -> List[str]:
+    """Get the services that accept records of a given size.
+
+    Lookups bisect a limit table built at import time and are memoized per
+    size, so changes to ``service_size_limits_bytes`` after import are not
+    picked up.
+
+    Args:
+        max_record_size_bytes (int): Size of the largest record in bytes.
+
+    Returns:
+        List[str]: Names of the services whose record size limit is not exceeded.
+    """
+    return list(_services_by_limit(max_record_size_bytes))
+
+
+def iter_json_records(
+        path: JSONLocalPath,
+        buffer_size: int = 65536,
+        max_record_size_bytes: int = None
+    ) -> Iterator[dict]:
+    """Stream records from a local JSON file.
+
+    Records are parsed incrementally with ``ijson`` when it is installed so the
+    whole file is never held in memory. Otherwise the file is loaded in full.
+
+    Args:
+        path (JSONLocalPath): Path to a local JSON file.
+        buffer_size (int, optional): Number of bytes read at a time. Defaults to 65536.
+        max_record_size_bytes (int, optional): Reject records larger than this. Defaults to None.
+
+    Yields:
+        dict: Each record in the top-level array, or the top-level object.
+
+    Raises:
+        InvalidJsonDataset: If the top-level element is not an array or object,
+            or a record is not an object.
+        RecordSizeLimitExceeded: If a record is larger than ``max_record_size_bytes``.
+    """
+    if ijson is None:
+        data = orjson.loads(Path(path).read_bytes())
+        if not isinstance(data, (list, dict)):
+            raise InvalidJsonDataset()
+        records = data if isinstance(data, list) else [data]
+    else:
+        records = _iter_ijson_items(path, buffer_size)
+
+    # records are validated as they are parsed instead of in a second pass
+    for idx, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise InvalidJsonDataset(idx)
+        if max_record_size_bytes is not None:
+            size = get_record_size_bytes(record)
+            if size > max_record_size_bytes:
+                raise RecordSizeLimitExceeded(size=size, limit=max_record_size_bytes)
+        yield record
+
+
+def _iter_ijson_items(path: JSONLocalPath, buffer_size: int) -> Iterator:
+    with open(path, 'rb') as f:
+        events = ijson.parse(f, buf_size=buffer_size, use_float=True)
+        first = next(events)
+        if first[1] == "start_array":
+            prefix = "item"
+        elif first[1] == "start_map":
+            prefix = ""
+        else:
+            raise InvalidJsonDataset()
+        yield from ijson.items(chain([first], events), prefix)
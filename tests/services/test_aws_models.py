@@ -1,7 +1,9 @@
 import sys
 sys.path.append("../awsjsondataset")
+import asyncio
 import pytest
 from pathlib import Path
+import awsjsondataset.services.models
 from awsjsondataset.services.models import (
     AwsServiceBase,
     SqsQueue,
@@ -25,6 +27,13 @@ def test_sqs_queue_attrs(sts, sqs):
     assert _sqs.region_name == "us-east-1"
     assert _sqs.account_id == "123456789012"
     assert _sqs.client._endpoint.host == "https://sqs.us-east-1.amazonaws.com"
+    assert _sqs.client.meta.config.max_pool_connections == 64
+    assert _sqs.client.meta.config.tcp_keepalive is True
+    assert _sqs.client.meta.config.retries["mode"] == "adaptive"
+    assert _sqs.max_workers == 32
+
+    # clients are shared across instances
+    assert SqsQueue(queue_url=queue_url).client is _sqs.client
 
 @mock_sts
 @mock_sqs
@@ -45,6 +54,43 @@ def test_sqs_queue_send_messages(sts, sqs):
     response = _sqs.send_messages()
     assert response is None
 
+@mock_sts
+@mock_sqs
+def test_sqs_queue_context_manager(sts, sqs):
+
+    queue_url = sqs.create_queue(QueueName="test_queue")["QueueUrl"]
+    with SqsQueue(queue_url=queue_url) as _sqs:
+        _sqs.data = [{"a": 1}, {"b": 2}]*10
+        assert _sqs.send_messages() is None
+
+    # the shared client reconnects after being closed
+    _sqs = SqsQueue(queue_url=queue_url)
+    _sqs.data = [{"a": 1}, {"b": 2}]
+    assert _sqs.send_messages() is None
+    _sqs.close()
+
+    # the base class has no client to close
+    with AwsServiceBase() as service:
+        assert service.region_name == "us-east-1"
+
+@mock_sts
+@mock_sqs
+def test_sqs_queue_send_messages_async_fallback(monkeypatch, sts, sqs):
+
+    monkeypatch.setattr(awsjsondataset.services.models, "get_aio_session", None)
+    queue_url = sqs.create_queue(QueueName="test_queue")["QueueUrl"]
+    _sqs = SqsQueue(queue_url=queue_url)
+
+    # falls back to the synchronous client without aiobotocore
+    _sqs.data = [{"a": 1}, {"b": 2}]*10
+    response = asyncio.run(_sqs.send_messages_async())
+    assert response is None
+
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=["ApproximateNumberOfMessages"])["Attributes"]
+    assert attributes["ApproximateNumberOfMessages"] == "20"
+
 @mock_sts
 @mock_sns
 def test_sns_topic_attrs(sts, sns):
@@ -109,3 +155,26 @@ def test_kinesis_firehose_delivery_stream(s3, sts, firehose):
     assert response is None
 
 
+
+@mock_s3
+@mock_sts
+@mock_firehose
+def test_kinesis_firehose_delivery_stream_put_records_async_fallback(monkeypatch, s3, sts, firehose):
+
+    monkeypatch.setattr(awsjsondataset.services.models, "get_aio_session", None)
+    DATA_BUCKET_NAME = 'data-bucket'
+    s3.create_bucket(Bucket=DATA_BUCKET_NAME)
+
+    DELIVERY_STREAM_NAME = "data-delivery-stream"
+    firehose.create_delivery_stream(
+        DeliveryStreamName=DELIVERY_STREAM_NAME,
+        ExtendedS3DestinationConfiguration={
+            'RoleARN': 'arn:aws:iam::123456789012:role/firehose_delivery_role',
+            'BucketARN': f'arn:aws:s3:::{DATA_BUCKET_NAME}'
+        })
+
+    # falls back to the synchronous client without aiobotocore
+    _firehose = KinesisFirehoseDeliveryStream(stream_name=DELIVERY_STREAM_NAME)
+    _firehose.data = [{"a": 1}, {"b": 2}]*10
+    response = asyncio.run(_firehose.put_records_async())
+    assert response is None
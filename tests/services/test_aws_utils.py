@@ -1,16 +1,67 @@
 import sys
 sys.path.append("../awsjsondataset")
+import asyncio
 import pytest
+from botocore.exceptions import ClientError
+import awsjsondataset.services.utils
+from awsjsondataset.exceptions import MissingRecords, ServiceRecordSizeLimitExceeded
 from awsjsondataset.services.utils import (
     send_messages,
     send_message_batch,
+    send_messages_async,
     publish_record,
     publish_messages_batch,
     put_record,
-    put_records_batch
+    put_records_batch,
+    put_records_async,
+    _iter_message_batches,
+    _iter_batches
 )
 from tests.fixtures import *
 
+class StubAioClient:
+    """Answers aiobotocore calls with handlers and tracks the requests in flight"""
+    def __init__(self, **handlers):
+        self.handlers = handlers
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __getattr__(self, name):
+        handler = self.handlers[name]
+
+        async def call(**kwargs):
+            self.calls.append((name, kwargs))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0)
+            self.in_flight -= 1
+            return handler(**kwargs)
+
+        return call
+
+    def requests(self, name):
+        return [ kwargs for call, kwargs in self.calls if call == name ]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+class StubAioSession:
+    """Hands out a stub client and keeps the config it was created with"""
+    def __init__(self, client):
+        self.client = client
+        self.config = None
+
+    def create_client(self, service_name, region_name=None, config=None):
+        self.config = config
+        return self.client
+
+def failed_request(**kwargs):
+    raise ClientError({"Error": {"Code": "InternalError", "Message": "failed"}}, "Request")
+
 ### SQS ###
 @mock_sqs
 def test_send_messages(sqs):
@@ -22,6 +73,150 @@ def test_send_messages(sqs):
     data = [{"a": 1}, {"b": 2}]
     assert send_messages(sqs, data, QUEUE_NAME) == None
 
+    class CountingClient:
+        """Counts the batch requests sent to the queue"""
+        def __init__(self, client):
+            self.client = client
+            self.batch_requests = 0
+
+        def send_message_batch(self, **kwargs):
+            self.batch_requests += 1
+            return self.client.send_message_batch(**kwargs)
+
+    # test that small batches are sent in a single request
+    queue_url = sqs.create_queue(QueueName="small-batch")["QueueUrl"]
+    data = [ {idx:idx+1} for idx in range(5) ]
+    client = CountingClient(sqs)
+    assert send_messages(client, data, queue_url) == None
+    assert client.batch_requests == 1
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=["ApproximateNumberOfMessages"])["Attributes"]
+    assert attributes["ApproximateNumberOfMessages"] == "5"
+
+    # test that encoded payloads are sent as is
+    queue_url = sqs.create_queue(QueueName="payloads")["QueueUrl"]
+    data = [{"a": 1}, {"b": 2}]
+    assert send_messages(sqs, data, queue_url, payloads=[b'{"a":1}', b'{"b":2}']) == None
+    messages = sqs.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10)["Messages"]
+    assert sorted(message["Body"] for message in messages) == ['{"a":1}', '{"b":2}']
+
+    # test that iterators are accepted
+    queue_url = sqs.create_queue(QueueName="iterator")["QueueUrl"]
+    data = ( {idx:idx+1} for idx in range(25) )
+    assert send_messages(sqs, data, queue_url) == None
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=["ApproximateNumberOfMessages"])["Attributes"]
+    assert attributes["ApproximateNumberOfMessages"] == "25"
+
+@mock_sqs
+def test_send_messages_streaming(sqs):
+
+    class ConsumptionClient:
+        """Records how many messages were read when each batch is sent"""
+        def __init__(self, client):
+            self.client = client
+            self.read = 0
+            self.read_at_send = []
+
+        def send_message_batch(self, **kwargs):
+            self.read_at_send.append(self.read)
+            return self.client.send_message_batch(**kwargs)
+
+    def messages(client):
+        for idx in range(200):
+            client.read += 1
+            yield {idx:idx+1}
+
+    # test that batches are sent while the iterator is still being read
+    queue_url = sqs.create_queue(QueueName="streaming")["QueueUrl"]
+    client = ConsumptionClient(sqs)
+    assert send_messages(client, messages(client), queue_url, max_workers=1) == None
+    assert len(client.read_at_send) == 20
+    assert all(read <= (idx + 4) * 10 for idx, read in enumerate(client.read_at_send))
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=["ApproximateNumberOfMessages"])["Attributes"]
+    assert attributes["ApproximateNumberOfMessages"] == "200"
+
+    # test that lists are size checked before any batch is sent
+    queue_url = sqs.create_queue(QueueName="oversized")["QueueUrl"]
+    data = [ {idx:idx+1} for idx in range(30) ]
+    data[25] = {"field": "value"*100000}
+    with pytest.raises(ServiceRecordSizeLimitExceeded):
+        send_messages(sqs, data, queue_url)
+    with pytest.raises(ServiceRecordSizeLimitExceeded):
+        send_messages(sqs, iter(data), queue_url, payloads=[ b"{}" ]*25 + [ b"x"*262145 ])
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=["ApproximateNumberOfMessages"])["Attributes"]
+    assert attributes["ApproximateNumberOfMessages"] == "0"
+
+    # iterators are sent as they are read, so earlier batches go out first
+    with pytest.raises(ServiceRecordSizeLimitExceeded):
+        send_messages(sqs, iter(data), queue_url)
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=["ApproximateNumberOfMessages"])["Attributes"]
+    assert attributes["ApproximateNumberOfMessages"] == "20"
+
+@mock_sqs
+def test_send_messages_partial_failure(sqs):
+
+    class PartialFailureClient:
+        """Reports the first entry of every batch as failed"""
+        def __init__(self, client):
+            self.client = client
+
+        def send_message_batch(self, QueueUrl, Entries):
+            response = self.client.send_message_batch(QueueUrl=QueueUrl, Entries=Entries[1:])
+            response["Failed"] = [{"Id": Entries[0]["Id"], "SenderFault": False, "Code": "InternalError"}]
+            return response
+
+        def send_message(self, **kwargs):
+            return self.client.send_message(**kwargs)
+
+    queue_url = sqs.create_queue(QueueName="partial-failure")["QueueUrl"]
+    data = [ {idx:idx+1} for idx in range(20) ]
+    assert send_messages(PartialFailureClient(sqs), data, queue_url) == None
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=["ApproximateNumberOfMessages"])["Attributes"]
+    assert attributes["ApproximateNumberOfMessages"] == "20"
+
+def test_send_messages_async(monkeypatch):
+    pytest.importorskip("aiobotocore")
+
+    def send_message_batch(QueueUrl, Entries):
+        # report the first entry of every batch as failed
+        return {
+            "Successful": [ {"Id": entry["Id"]} for entry in Entries[1:] ],
+            "Failed": [ {"Id": Entries[0]["Id"], "SenderFault": False, "Code": "InternalError"} ]
+        }
+
+    client = StubAioClient(send_message_batch=send_message_batch, send_message=lambda **kwargs: {})
+    session = StubAioSession(client)
+    monkeypatch.setattr(awsjsondataset.services.utils, "get_aio_session", lambda: session)
+
+    data = [ {idx:idx+1} for idx in range(25) ]
+    assert asyncio.run(send_messages_async(data, "queue-url", concurrency=2)) is None
+
+    # the connection pool is sized to the number of requests in flight
+    assert session.config.max_pool_connections == 2
+    assert session.config.retries["mode"] == "adaptive"
+    assert client.max_in_flight == 2
+
+    # failed entries are retried individually
+    assert [ len(request["Entries"]) for request in client.requests("send_message_batch") ] == [10, 10, 5]
+    assert sorted(request["MessageBody"] for request in client.requests("send_message")) == ['{"0":1}', '{"10":11}', '{"20":21}']
+
+    # test that failed retries are reported
+    client = StubAioClient(send_message_batch=send_message_batch, send_message=failed_request)
+    monkeypatch.setattr(awsjsondataset.services.utils, "get_aio_session", lambda: StubAioSession(client))
+    with pytest.raises(MissingRecords):
+        asyncio.run(send_messages_async(data, "queue-url"))
+
 @mock_sqs
 def test_send_message_batch(sqs):
     
@@ -33,13 +228,22 @@ def test_send_message_batch(sqs):
     data = [ {idx:idx+1} for idx in range(30) ]
     assert send_message_batch(sqs, data, QUEUE_NAME) == None
 
+    # test that the trailing batch is sent
+    data = [ {idx:idx+1} for idx in range(25) ]
+    queue_url = sqs.create_queue(QueueName="trailing-batch")["QueueUrl"]
+    assert send_message_batch(sqs, data, queue_url) == None
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=["ApproximateNumberOfMessages"])["Attributes"]
+    assert attributes["ApproximateNumberOfMessages"] == "25"
+
     # test for total in batch over 256kb
     data = [ {"field": "value"*10000} for idx in range(30) ]
     assert send_message_batch(sqs, data, QUEUE_NAME) == None
 
     # test for records over 256kb
     data = [ {"field": "value"*100000} for idx in range(30) ]
-    with pytest.raises(Exception):
+    with pytest.raises(ServiceRecordSizeLimitExceeded):
         send_message_batch(sqs, data, QUEUE_NAME)
 
     # test for 1 batch less than 10 records
@@ -51,6 +255,37 @@ def test_send_message_batch(sqs):
     with pytest.raises(Exception):
         send_message_batch(sqs, data, "wrong-queue")
 
+def test_iter_batches_byte_boundaries():
+    # the batch size is the sum of the bodies, not the size of a JSON array of them
+    payloads = [ b"x"*65536 ]*5
+    assert [ len(batch) for batch in _iter_batches(payloads, "sqs") ] == [4, 1]
+
+    # the delimiter counts against both the record and the batch limits
+    payloads = [ b"x"*1023999 ]*5
+    assert [ len(batch) for batch in _iter_batches(payloads, "firehose", delimiter_bytes=1) ] == [4, 1]
+    with pytest.raises(ServiceRecordSizeLimitExceeded):
+        list(_iter_batches([ b"x"*1024000 ], "firehose", delimiter_bytes=1))
+
+    # count limit and indices are preserved across batches
+    batches = list(_iter_batches([ b"{}" ]*21, "sqs"))
+    assert [ len(batch) for batch in batches ] == [10, 10, 1]
+    assert batches[2] == [(20, b"{}")]
+
+def test_iter_message_batches():
+    data = [ {idx:idx+1} for idx in range(25) ]
+    batches = list(_iter_message_batches(data))
+    assert [ len(batch) for batch in batches ] == [10, 10, 5]
+    # entry ids are unique within each batch request
+    assert [ entry["Id"] for entry in batches[2] ] == ["0", "1", "2", "3", "4"]
+    assert batches[2][0]["MessageBody"] == '{"20":21}'
+
+def test_iter_message_batches_entry_ids(monkeypatch):
+    # records are never dropped when a batch outgrows the entry ids
+    monkeypatch.setattr(awsjsondataset.services.utils, "_ENTRY_IDS", ("0", "1", "2", "3", "4"))
+    data = [ {idx:idx+1} for idx in range(25) ]
+    with pytest.raises(ValueError):
+        list(_iter_message_batches(data))
+
 ### SNS ###
 @mock_sns
 def test_publish_record(sns):
@@ -83,13 +318,33 @@ def test_publish_records_batch(sns):
 
     # test for error with records over 256kb
     data = [ {"field": "value"*100000} for idx in range(30) ]
-    with pytest.raises(Exception):
+    with pytest.raises(ServiceRecordSizeLimitExceeded):
         publish_messages_batch(client=sns, messages=data, topic_arn=TOPIC_ARN)
 
     # test for error with 1 batch less than 10 records
     data = [ {idx:idx+1} for idx in range(5) ]
     with pytest.raises(Exception):
         publish_messages_batch(client=sns, messages=data, topic_arn=TOPIC_ARN)
+
+@mock_sqs
+@mock_sns
+def test_publish_records_batch_delivery(sns, sqs):
+
+    # subscribe a queue to count delivered messages
+    topic_arn = sns.create_topic(Name="test-topic")['TopicArn']
+    queue_url = sqs.create_queue(QueueName="test-queue")["QueueUrl"]
+    queue_arn = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=["QueueArn"])["Attributes"]["QueueArn"]
+    sns.subscribe(TopicArn=topic_arn, Protocol="sqs", Endpoint=queue_arn)
+
+    # test that the trailing batch is published
+    data = [ {idx:idx+1} for idx in range(25) ]
+    assert publish_messages_batch(client=sns, messages=data, topic_arn=topic_arn) is None
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=["ApproximateNumberOfMessages"])["Attributes"]
+    assert attributes["ApproximateNumberOfMessages"] == "25"
         
 ### Kinesis ###
 @mock_firehose
@@ -108,13 +363,23 @@ def test_put_record(s3, firehose):
             'BucketARN': f'arn:aws:s3:::{DATA_BUCKET_NAME}'
         })
 
+    response = put_record(
+        client=firehose,
+        stream_name=DELIVERY_STREAM_NAME,
+        data={"test_field": "test_key"})
+    assert "RecordId" in response
+
+    # records are delivered as newline delimited JSON
+    key = s3.list_objects_v2(Bucket=DATA_BUCKET_NAME)["Contents"][0]["Key"]
+    assert s3.get_object(Bucket=DATA_BUCKET_NAME, Key=key)["Body"].read() == b'{"test_field":"test_key"}\n'
+
     response = put_record(
         client=firehose,
         stream_name=DELIVERY_STREAM_NAME,
         data='{"test_field":"test_key"}')
     assert "RecordId" in response
 
-    with pytest.raises(Exception):
+    with pytest.raises(ServiceRecordSizeLimitExceeded):
         put_record(
             client=firehose,
             stream_name=DELIVERY_STREAM_NAME,
@@ -185,4 +450,34 @@ def test_put_records_batch(s3, firehose):
             stream_name=DELIVERY_STREAM_NAME,
             records=data)
     
-    del data
\ No newline at end of file
+    del data
+
+def test_put_records_async(monkeypatch):
+    pytest.importorskip("aiobotocore")
+
+    def put_record_batch(DeliveryStreamName, Records):
+        # report one record of every batch as failed
+        return {"FailedPutCount": 1, "RequestResponses": [ {} for _ in Records ]}
+
+    client = StubAioClient(put_record_batch=lambda **kwargs: {"FailedPutCount": 0})
+    session = StubAioSession(client)
+    monkeypatch.setattr(awsjsondataset.services.utils, "get_aio_session", lambda: session)
+
+    data = [ {idx:idx+1} for idx in range(1200) ]
+    assert asyncio.run(put_records_async("data-delivery-stream", data, concurrency=2)) is None
+
+    # the connection pool is sized to the number of requests in flight
+    assert session.config.max_pool_connections == 2
+    assert session.config.retries["mode"] == "adaptive"
+    assert client.max_in_flight == 2
+
+    # records are batched and newline delimited
+    requests = client.requests("put_record_batch")
+    assert [ len(request["Records"]) for request in requests ] == [500, 500, 200]
+    assert requests[2]["Records"][0]["Data"] == b'{"1000":1001}\n'
+
+    # test that failed records are reported
+    client = StubAioClient(put_record_batch=put_record_batch)
+    monkeypatch.setattr(awsjsondataset.services.utils, "get_aio_session", lambda: StubAioSession(client))
+    with pytest.raises(MissingRecords):
+        asyncio.run(put_records_async("data-delivery-stream", data))
@@ -4,21 +4,16 @@ from datetime import datetime
 import pytest
 from pathlib import Path
 from awsjsondataset.models import (
-    DatetimeEncoder,
     JsonDataset,
     BaseAwsJsonDataset,
     AwsJsonDataset
 )
-from awsjsondataset.exceptions import InvalidJsonDataset
+from awsjsondataset.exceptions import InvalidJsonDataset, RecordSizeLimitExceeded
 from tests.fixtures import *
 
 root_dir = Path(__file__).parent.parent
 test_data_dir = root_dir / "tests" / "test_data"
 
-def test_datetime_encoder():
-    encoder = DatetimeEncoder()
-    assert encoder.default(datetime(2021, 1, 1, 0, 0, 0)) == "2021-01-01 00:00:00"
-
 def test_json_dataset_init():
 
     # test kwargs
@@ -62,6 +57,28 @@ def test_json_dataset_load():
     assert dataset.path == test_data_dir / "subtechniques.json"
     assert dataset.num_records == 21
 
+def test_json_dataset_iter_records():
+    dataset = JsonDataset(path=test_data_dir / "subtechniques.json", stream=True)
+    assert dataset.data is None
+    assert len(list(dataset.iter_records())) == 21
+
+    # streamed datasets hold no records to count or save
+    with pytest.raises(TypeError, match="no records loaded"):
+        len(dataset)
+    with pytest.raises(TypeError, match="no records loaded"):
+        dataset.num_records
+    with pytest.raises(TypeError, match="no records loaded"):
+        dataset.save(test_data_dir / "test.json")
+
+    dataset = JsonDataset(path=test_data_dir / "subtechniques.json")
+    assert list(dataset.iter_records()) == dataset.data
+
+    # the size limit applies to loaded records too
+    limit = dataset._max_record_size_bytes
+    assert len(list(dataset.iter_records(max_record_size_bytes=limit))) == 21
+    with pytest.raises(RecordSizeLimitExceeded):
+        next(dataset.iter_records(max_record_size_bytes=limit - 1))
+
 def test_json_dataset_save():
     dataset = JsonDataset(data=[{"a": 1}, {"b": 2}])
     dataset.save(test_data_dir / "test.json")
@@ -69,13 +86,43 @@ def test_json_dataset_save():
     # clean up
     (test_data_dir / "test.json").unlink()
 
+    # datetimes are written as strings, naive datetimes as UTC
+    dataset = JsonDataset(data=[{"a": datetime(2021, 1, 1, 0, 0, 0)}])
+    dataset.save(test_data_dir / "test.json")
+    assert JsonDataset(path=test_data_dir / "test.json").data == [{"a": "2021-01-01T00:00:00+00:00"}]
+    (test_data_dir / "test.json").unlink()
+
+def test_json_dataset_load_single_object(tmp_path):
+    path = tmp_path / "record.json"
+    path.write_bytes(b'{"a": 1, "b": [1.5, null, "\xc3\xa9"]}')
+    assert JsonDataset(path=path).data == [{"a": 1, "b": [1.5, None, "\u00e9"]}]
+
 def test_json_dataset_records_by_size_kb():
     dataset = JsonDataset(data=[{"a": 1}, {"b": 2}])
-    assert dataset._sort_records_by_size_bytes == [({"a": 1}, 57), ({"b": 2}, 57)]
+    assert dataset._sort_records_by_size_bytes == [({"a": 1}, 7), ({"b": 2}, 7)]
 
 def test_json_dataset_max_record_size_kb():
     dataset = JsonDataset(data=[{"a": 1}, {"b": 2}])
-    assert dataset._max_record_size_bytes == 57
+    assert dataset._max_record_size_bytes == 7
+
+def test_json_dataset_encoded():
+    dataset = JsonDataset(data=[{"a": 1}, {"b": 2}])
+    assert dataset._encoded == [b'{"a":1}', b'{"b":2}']
+    assert dataset._max_record_size_bytes == 7
+
+    # cached values are invalidated when data is reassigned
+    dataset.data = [{"a": 12345}]
+    assert dataset._encoded == [b'{"a":12345}']
+    assert dataset._max_record_size_bytes == 11
+
+def test_json_dataset_repr():
+    dataset = JsonDataset(data=[{"a": "value"*100}, {"b": 2}])
+    assert repr(dataset) == "JsonDataset(data='{\"a\":\"valuevaluevaluevaluevalu...', num_records=2)"
+
+    dataset = JsonDataset(path=test_data_dir / "subtechniques.json", stream=True)
+    assert repr(dataset).startswith("JsonDataset(path=")
+
+    assert repr(AwsJsonDataset(data=[{"a": 1}])) == "AwsJsonDataset(data='{\"a\":1}...', num_records=1)"
 
 def test_base_aws_json_dataset_init():
     dataset = BaseAwsJsonDataset(data=[{"a": 1}, {"b": 2}])
@@ -116,6 +163,10 @@ def test_aws_json_dataset_available_services():
     dataset = BaseAwsJsonDataset(data=[{"a": "value"*1000000}])
     assert "sqs" not in dataset.available_services
 
+    # available services are recomputed when data is reassigned
+    dataset.data = [{"a": 1}]
+    assert "sqs" in dataset.available_services
+
     # sns within size limit
     dataset = BaseAwsJsonDataset(data=[{"a": 1}, {"b": 2}])
     assert "sns" in dataset.available_services
@@ -144,6 +195,11 @@ def test_aws_json_dataset_init():
     assert dataset.path == test_data_dir / "subtechniques.json"
     assert dataset.num_records == 21
 
+    # empty dataset
+    dataset = AwsJsonDataset(data=[])
+    assert dataset.num_records == 0
+    assert dataset.available_services == ["sqs", "sns", "firehose"]
+
     # test args
     dataset = AwsJsonDataset(data=[{"a": 1}, {"b": 2}])
     assert dataset.data == [{"a": 1}, {"b": 2}]
@@ -173,7 +229,19 @@ def test_aws_json_dataset_attrs():
     for item in dataset.available_services:
         assert hasattr(dataset, item)
 
-    # TODO test that service is not in available services if records is too large
+    # services follow the records when data is reassigned
+    dataset.data = [{"a": "x"*300000}]
+    assert dataset.available_services == ["firehose"]
+    assert not hasattr(dataset, "sqs")
+    assert not hasattr(dataset, "sns")
+    assert hasattr(dataset, "firehose")
+
+    dataset = AwsJsonDataset(data=[{"a": "x"*300000}])
+    assert not hasattr(dataset, "sqs")
+    dataset.data = [{"a": 1}]
+    assert hasattr(dataset, "sqs")
+    with pytest.raises(AttributeError):
+        dataset.s3
 
 @mock_sqs
 def test_aws_json_dataset_sqs_send_messages(sqs):
@@ -184,6 +252,16 @@ def test_aws_json_dataset_sqs_send_messages(sqs):
     dataset = AwsJsonDataset(data=[{"a": 1}, {"b": 2}])
     assert dataset.sqs(queue_url).send_messages() is None
 
+    # service wrappers reuse the encoded records of the dataset
+    queue = dataset.sqs(queue_url)
+    assert queue.data is dataset.data
+    assert queue.payloads is dataset._encoded
+
+    # payloads are dropped when the wrapper is given other records
+    queue.data = [{"c": 3}]
+    assert queue.payloads is None
+    assert queue.send_messages() is None
+
 @mock_sns
 def test_aws_json_dataset_sns_publish(sns):
     
@@ -1,26 +1,46 @@
 import sys
 sys.path.append("../awsjsondataset")
 import pytest
-from awsjsondataset.exceptions import InvalidJsonDataset
+from pathlib import Path
+from collections import OrderedDict
+import awsjsondataset.utils
+from awsjsondataset.exceptions import InvalidJsonDataset, RecordSizeLimitExceeded
 from awsjsondataset.utils import (
+    serialize_record,
     get_record_size_bytes,
     sort_records_by_size_bytes,
     max_record_size_bytes,
     validate_data,
-    get_available_services_by_limit
+    get_available_services_by_limit,
+    iter_json_records
 )
 from tests.fixtures import *
 
+test_data_dir = Path(__file__).parent / "test_data"
+
+def test_serialize_record():
+    assert serialize_record({"a": 1}) == b'{"a":1}'
+    assert serialize_record({1: 2}) == b'{"1":2}'
+    assert serialize_record({1: 2}, append_newline=True) == b'{"1":2}\n'
+
 def test_get_record_size_bytes():
     record = {"a": 1}
-    assert get_record_size_bytes(record) == 57
+    assert get_record_size_bytes(record) == 7
+
+    # multi-byte characters are counted in encoded bytes
+    record = {"a": "é"}
+    assert get_record_size_bytes(record) == 10
+    record = {"a": "日本"}
+    assert get_record_size_bytes(record) == 14
 
 def test_sort_records_by_size_bytes():
     records = [{"a": 1}, {"b": 1234567891011}]
-    assert sort_records_by_size_bytes(records) == [(records[0], 57), (records[1], 69)]
+    assert sort_records_by_size_bytes(records) == [(records[0], 7), (records[1], 19)]
 
     records = [{"a": 1}, {"b": 1234567891011}]
-    assert sort_records_by_size_bytes(records, ascending=False) == [(records[1], 69), (records[0], 57)]
+    assert sort_records_by_size_bytes(records, ascending=False) == [(records[1], 19), (records[0], 7)]
+
+    assert sort_records_by_size_bytes(iter(records)) == [(records[0], 7), (records[1], 19)]
 
 def test_validate_data():
     data = [{"a": 1}, {"b": 1234567891011}]
@@ -30,11 +50,67 @@ def test_validate_data():
     with pytest.raises(InvalidJsonDataset):
         validate_data(data)
 
+    data = [{"a": 1}, OrderedDict(b=2), "c"]
+    with pytest.raises(InvalidJsonDataset, match="record 2"):
+        validate_data(data)
+
+    data = [OrderedDict(a=1)]
+    assert validate_data(data) == data
+
 def test_max_record_size_bytes():
     data = [{"a": 1}, {"b": 1234567891011}]
-    assert max_record_size_bytes(data) == 69
+    assert max_record_size_bytes(data) == 19
+    assert max_record_size_bytes([]) == 0
 
 def test_get_available_services_by_limit():
     assert get_available_services_by_limit(max_record_size_bytes=1000) == ['sqs', 'sns', 'firehose']
     assert get_available_services_by_limit(max_record_size_bytes=1000000) == ['firehose']
+    assert get_available_services_by_limit(max_record_size_bytes=2000000) == []
+    assert get_available_services_by_limit(max_record_size_bytes=262144) == ['sqs', 'sns', 'firehose']
+    assert get_available_services_by_limit(max_record_size_bytes=262145) == ['firehose']
+    # the newline appended to Firehose records counts against the limit
+    assert get_available_services_by_limit(max_record_size_bytes=1023999) == ['firehose']
+    assert get_available_services_by_limit(max_record_size_bytes=1024000) == []
+    assert get_available_services_by_limit(max_record_size_bytes=1024001) == []
+
 
+def test_get_available_services_by_limit_returns_copy():
+    services = get_available_services_by_limit(1000)
+    services.clear()
+    assert get_available_services_by_limit(1000) == ['sqs', 'sns', 'firehose']
+
+def test_iter_json_records(monkeypatch, tmp_path):
+    records = iter_json_records(test_data_dir / "subtechniques.json", buffer_size=1024)
+    assert not isinstance(records, list)
+    assert len(list(records)) == 21
+
+    # top-level object is a single record
+    assert len(list(iter_json_records(test_data_dir / "bad-json.json"))) == 1
+
+    with pytest.raises(RecordSizeLimitExceeded):
+        list(iter_json_records(test_data_dir / "subtechniques.json", max_record_size_bytes=100))
+
+    # records exactly at the limit are accepted
+    size = max_record_size_bytes(list(iter_json_records(test_data_dir / "subtechniques.json")))
+    assert len(list(iter_json_records(test_data_dir / "subtechniques.json", max_record_size_bytes=size))) == 21
+    with pytest.raises(RecordSizeLimitExceeded, match=f"limit of {size - 1} bytes"):
+        list(iter_json_records(test_data_dir / "subtechniques.json", max_record_size_bytes=size - 1))
+
+    (tmp_path / "scalar.json").write_text("1")
+    with pytest.raises(InvalidJsonDataset):
+        list(iter_json_records(tmp_path / "scalar.json"))
+
+    # records are validated while streaming
+    (tmp_path / "mixed.json").write_text('[{"a": 1}, 2]')
+    records = iter_json_records(tmp_path / "mixed.json")
+    assert next(records) == {"a": 1}
+    with pytest.raises(InvalidJsonDataset, match="record 1"):
+        next(records)
+
+    # fall back to loading the whole file without ijson
+    monkeypatch.setattr(awsjsondataset.utils, "ijson", None)
+    assert len(list(iter_json_records(test_data_dir / "subtechniques.json"))) == 21
+    with pytest.raises(InvalidJsonDataset):
+        list(iter_json_records(tmp_path / "scalar.json"))
+    with pytest.raises(InvalidJsonDataset, match="record 1"):
+        list(iter_json_records(tmp_path / "mixed.json"))